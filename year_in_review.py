@@ -11,16 +11,36 @@ Usage:
 Example:
     python3 year_in_review.py 123570621
     python3 year_in_review.py 123570621 https://viaduct-staging.d.musta.ch/graphql 2024
+
+Set AIRBNB_YIR_CACHE=1 to cache Viaduct responses for past years under
+~/.cache/airbnb_yir/ for 24 hours.
 """
 
+import os
 import sys
 import json
+import time
+import hashlib
+import functools
+import textwrap
 import requests
-from typing import Dict, List, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Any, Generator, Iterable, Iterator, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import base64
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to stdlib json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # without ijson, extra trip pages are parsed whole
+    ijson = None
+
 
 @dataclass
 class TripDetail:
@@ -98,33 +118,236 @@ class YearInReviewSummary:
     highlights: List[str]
 
 
+def _minify_query(query: str) -> str:
+    """Collapse a GraphQL document's whitespace to keep request bodies small"""
+    return " ".join(query.split())
+
+
+# Root selections for the year-in-review data. Both node() lookups are aliased
+# so they can share one document and be split back up by the process_* methods.
+_Q_USER_PROFILE = _minify_query("""
+    profile: node(id: $userIdEncoded) {
+      ... on User {
+        createdAt
+        isSuperHost
+        highlyRated
+      }
+    }
+""")
+
+# $after is omitted for the first page and set to pageInfo.endCursor after that
+_Q_TRIPS = _minify_query("""
+    trips {
+      tripEvents(
+        userId: $userIdString
+        sortDirection: DESC
+        orderBy: STARTS_AT
+        first: 100
+        after: $after
+      ) {
+        edges {
+          node {
+            productType
+            startsAt
+            stayReservation {
+              startDate
+              numberOfNights
+              listing {
+                supplyListing {
+                  location {
+                    defaultAddress {
+                      locality
+                      country
+                    }
+                  }
+                }
+              }
+            }
+            experienceGuestProfile {
+              template {
+                cityNative
+              }
+            }
+          }
+        }
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+      }
+    }
+""")
+
+_Q_REVIEWS = _minify_query("""
+    reviews: node(id: $userIdEncoded) {
+      ... on User {
+        reviews(filter: WRITTEN_REVIEWS, first: 100) {
+          edges {
+            node {
+              review {
+                ... on UserProfileReview {
+                  rating
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+""")
+
+_Q_WISHLISTS = _minify_query("""
+    viewer {
+      wishlists(first: 50) {
+        edges {
+          node {
+            name
+            productCounts {
+              staysCount
+              experiencesCount
+            }
+          }
+        }
+      }
+    }
+""")
+
+_Q_YEAR_IN_REVIEW = (
+    "query GetYearInReview($userIdEncoded: ID!, $userIdString: String!, $after: String) { "
+    f"{_Q_USER_PROFILE} {_Q_TRIPS} {_Q_REVIEWS} {_Q_WISHLISTS} }}"
+)
+
+_Q_TRIP_PAGE = f"query GetUserTrips($userIdString: String!, $after: String) {{ {_Q_TRIPS} }}"
+
+
+def _dig(d: Any, path: Tuple[str, ...]) -> Any:
+    """Walk nested dicts along path, returning None at the first missing key"""
+    for key in path:
+        d = d.get(key) if isinstance(d, dict) else None
+        if d is None:
+            return None
+    return d
+
+
+def _trip_edges_in_range(
+    edges: Iterable[Dict[str, Any]],
+    start_date: str,
+    end_date: str
+) -> Iterator[Dict[str, Any]]:
+    """Yield trip edges whose startsAt falls within [start_date, end_date]"""
+    # Filter trips by date in Python since we can't use duplicate filters.
+    # Edges are sorted by startsAt DESC, so the first trip before start_date
+    # means every remaining trip is out of range too
+    for edge in edges:
+        starts_at = _dig(edge, ("node", "startsAt"))
+        if not starts_at or starts_at > end_date:
+            continue
+        if starts_at < start_date:
+            break
+        yield edge
+
+
+def _warn_graphql_errors(data: Dict[str, Any]):
+    """Print any top-level GraphQL errors from a response"""
+    if "errors" in data:
+        print(f"⚠️  GraphQL returned errors:")
+        print(json.dumps(data["errors"], indent=2))
+
+
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "airbnb_yir")
+_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _disk_cached(execute_query):
+    """Serve query results from the on-disk cache when the client has caching enabled"""
+    @functools.wraps(execute_query)
+    def wrapper(self, query: str, variables: Dict[str, Any] = None, stream: bool = False) -> Any:
+        if not self.use_cache or stream:
+            return execute_query(self, query, variables, stream)
+
+        key_source = self.viaduct_url + query + json.dumps(variables or {}, sort_keys=True) + self.user_id
+        key = hashlib.blake2b(key_source.encode(), digest_size=16).hexdigest()
+        path = os.path.join(_CACHE_DIR, f"{key}.json")
+
+        try:
+            if time.time() - os.path.getmtime(path) < _CACHE_TTL_SECONDS:
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass  # Missing or unreadable entry, fall through to the network
+
+        data = execute_query(self, query, variables, stream)
+
+        # Don't pin a partial result for a day; the cache is best effort otherwise
+        if "errors" not in data:
+            try:
+                os.makedirs(_CACHE_DIR, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass
+
+        return data
+
+    return wrapper
+
+
 class ViaductGraphQLClient:
-    def __init__(self, viaduct_url: str, user_id: str):
+    def __init__(self, viaduct_url: str, user_id: str, use_cache: bool = False):
         self.viaduct_url = viaduct_url
         self.user_id = user_id
+        self.use_cache = use_cache
+        # Viaduct node IDs are base64 encoded "User:<id>"
+        self.encoded_user_id = base64.b64encode(f"User:{user_id}".encode()).decode()
         self.session = requests.Session()
-
-    def execute_query(self, query: str, variables: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute a GraphQL query against Viaduct"""
-        variables = variables or {}
-
-        headers = {
+        self.session.headers.update({
             "Content-Type": "application/json",
             "x-airbnb-req-userid": self.user_id,
             "x-csrf-without-token": "1",
             "x-airbnb-viaduct-include-metadata": "y"
-        }
+        })
+
+        # Keep connections warm and retry transient gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=["POST"],
+                raise_on_status=False  # Let execute_query report the final status
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @_disk_cached
+    def execute_query(self, query: str, variables: Dict[str, Any] = None, stream: bool = False) -> Any:
+        """Execute a GraphQL query against Viaduct
+
+        With stream=True the raw response body is returned as a file-like object
+        for incremental parsing instead of the decoded JSON.
+        """
+        variables = variables or {}
 
         payload = {
             "query": query,
             "variables": variables
         }
 
+        if orjson is not None:
+            body = orjson.dumps(payload)
+        else:
+            body = json.dumps(payload).encode()
+
         response = self.session.post(
             self.viaduct_url,
-            json=payload,
-            headers=headers,
-            timeout=30
+            data=body,
+            timeout=30,
+            stream=stream
         )
 
         if response.status_code != 200:
@@ -132,11 +355,13 @@ class ViaductGraphQLClient:
                 f"GraphQL request failed with status {response.status_code}: {response.text}"
             )
 
-        data = response.json()
+        if stream:
+            response.raw.decode_content = True
+            return response.raw
+
+        data = orjson.loads(response.content) if orjson is not None else response.json()
 
-        if "errors" in data:
-            print(f"⚠️  GraphQL returned errors:")
-            print(json.dumps(data["errors"], indent=2))
+        _warn_graphql_errors(data)
 
         return data
 
@@ -154,18 +379,14 @@ class YearInReviewGenerator:
         start_date = f"{self.year}-01-01T00:00:00Z"
         end_date = f"{self.year + 1}-01-01T00:00:00Z"
 
-        # Fetch all data
-        user_profile_data = self.fetch_user_profile()
-        trip_data = self.fetch_trip_data(start_date, end_date)
-        review_data = self.fetch_review_data()
-        wishlist_data = self.fetch_wishlist_data()
+        # Fetch all data in one round-trip
+        data = self.fetch_all()
 
         # Process data
-        user_profile = self.process_user_profile(user_profile_data)
-        trips = self.process_trip_data(trip_data)
-        experiences = self.process_experience_data(trip_data)
-        reviews = self.process_review_data(review_data)
-        wishlists = self.process_wishlist_data(wishlist_data)
+        user_profile = self.process_user_profile(data)
+        trips, experiences = self.process_trips_and_experiences(data, start_date, end_date)
+        reviews = self.process_review_data(data)
+        wishlists = self.process_wishlist_data(data)
         community = CommunitySummary(
             hosts_connected=len(trips.destinations),
             messages_exchanged=0  # Would need messaging API
@@ -192,176 +413,96 @@ class YearInReviewGenerator:
             highlights=highlights
         )
 
-    def fetch_user_profile(self) -> Dict[str, Any]:
-        """Fetch user profile data including badges and member info"""
-        print("👤 Fetching user profile...")
-
-        query = """
-            query GetUserProfile($userId: ID!) {
-              node(id: $userId) {
-                ... on User {
-                  id
-                  createdAt
-                  isSuperHost
-                  highlyRated
-                }
-              }
-            }
-        """
+    def fetch_all(self) -> Dict[str, Any]:
+        """Fetch profile, trips, reviews, and wishlists in a single batched query"""
+        print("📡 Fetching profile, trips, reviews, and wishlists...")
 
-        # Convert numeric userId to base64 encoded ID
-        encoded_user_id = base64.b64encode(f"User:{self.user_id}".encode()).decode()
-
-        return self.client.execute_query(query, {"userId": encoded_user_id})
-
-    def fetch_trip_data(self, start_date: str, end_date: str) -> Dict[str, Any]:
-        """Fetch trip events from Viaduct"""
-        print("📍 Fetching trip data...")
-
-        query = """
-            query GetUserTrips($userId: String!) {
-              trips {
-                tripEvents(
-                  userId: $userId
-                  sortDirection: DESC
-                  orderBy: STARTS_AT
-                  first: 100
-                ) {
-                  edges {
-                    node {
-                      id
-                      eventType
-                      productType
-                      startsAt
-                      endsAt
-                      city
-                      confirmationCode
-                      stayReservation {
-                        confirmationCode
-                        startDate
-                        endDate
-                        numberOfNights
-                        listing {
-                          name
-                          supplyListing {
-                            location {
-                              defaultAddress {
-                                locality
-                                administrativeZone
-                                country
-                              }
-                            }
-                          }
-                        }
-                      }
-                      experienceGuestProfile {
-                        template {
-                          nameOrPlaceholderName
-                          cityNative
-                          countryName
-                          isOnlineExperience
-                        }
-                        experienceReservation {
-                          startsAt
-                        }
-                      }
-                    }
-                  }
-                }
-              }
-            }
-        """
+        variables = {
+            "userIdEncoded": self.client.encoded_user_id,
+            "userIdString": self.user_id
+        }
+
+        return self.client.execute_query(_Q_YEAR_IN_REVIEW, variables)
+
+    def fetch_trip_page(self, after: str) -> Dict[str, Any]:
+        """Fetch the next page of trip events after the given cursor"""
+        print("📍 Fetching more trip data...")
 
         variables = {
-            "userId": self.user_id
+            "userIdString": self.user_id,
+            "after": after
         }
 
-        result = self.client.execute_query(query, variables)
-
-        # Filter trips by date in Python since we can't use duplicate filters
-        if result.get("data", {}).get("trips", {}).get("tripEvents"):
-            edges = result["data"]["trips"]["tripEvents"].get("edges", [])
-            filtered_edges = []
-            for edge in edges:
-                node = edge.get("node", {})
-                starts_at = node.get("startsAt")
-                if starts_at:
-                    # Check if trip is within date range
-                    if start_date <= starts_at <= end_date:
-                        filtered_edges.append(edge)
-            result["data"]["trips"]["tripEvents"]["edges"] = filtered_edges
-
-        return result
-
-    def fetch_review_data(self) -> Dict[str, Any]:
-        """Fetch user reviews from Viaduct"""
-        print("⭐ Fetching review data...")
-
-        query = """
-            query GetUserReviews($userId: ID!) {
-              node(id: $userId) {
-                ... on User {
-                  reviews(filter: WRITTEN_REVIEWS, first: 100) {
-                    edges {
-                      node {
-                        review {
-                          ... on UserProfileReview {
-                            id
-                            rating
-                            createdAt
-                          }
-                        }
-                      }
-                    }
-                  }
-                }
-              }
-            }
-        """
+        return self.client.execute_query(_Q_TRIP_PAGE, variables)
 
-        # Convert numeric userId to base64 encoded ID
-        encoded_user_id = base64.b64encode(f"User:{self.user_id}".encode()).decode()
-
-        return self.client.execute_query(query, {"userId": encoded_user_id})
-
-    def fetch_wishlist_data(self) -> Dict[str, Any]:
-        """Fetch user wishlists from Viaduct"""
-        print("💝 Fetching wishlist data...")
-
-        query = """
-            query GetUserWishlists {
-              viewer {
-                wishlists(first: 50) {
-                  edges {
-                    node {
-                      id
-                      name
-                      createdAt
-                      productCounts {
-                        staysCount
-                        experiencesCount
-                      }
-                    }
-                  }
-                }
-              }
-            }
+    def stream_trip_page(self, after: str) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+        """Stream the next page of trip edges after the given cursor, one edge at a time
+
+        Everything outside the edges (pageInfo, errors) is built into a regular
+        response dict, which is returned once the stream is exhausted.
         """
+        print("📍 Fetching more trip data...")
 
-        return self.client.execute_query(query)
+        variables = {
+            "userIdString": self.user_id,
+            "after": after
+        }
+
+        edge_prefix = "data.trips.tripEvents.edges.item"
+        rest = ijson.ObjectBuilder()
+        edge = None
+
+        raw = self.client.execute_query(_Q_TRIP_PAGE, variables, stream=True)
+        try:
+            for prefix, event, value in ijson.parse(raw, use_float=True):
+                if edge is None and not (prefix == edge_prefix and event == "start_map"):
+                    rest.event(event, value)
+                    continue
+                if edge is None:
+                    edge = ijson.ObjectBuilder()
+                edge.event(event, value)
+                if prefix == edge_prefix and event == "end_map":
+                    yield edge.value
+                    edge = None
+        finally:
+            raw.close()
+
+        data = rest.value if isinstance(rest.value, dict) else {}
+        _warn_graphql_errors(data)
+        return data
+
+    def iter_trip_edges(self, data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield trip edges from the batched response, fetching older pages on demand"""
+        trip_events = _dig(data, ("data", "trips", "tripEvents")) or {}
+        page_info = trip_events.get("pageInfo") or {}
+        yield from trip_events.get("edges") or []
+
+        has_next_page = page_info.get("hasNextPage")
+        cursor = page_info.get("endCursor")
+
+        # Older pages are only requested while the caller keeps iterating. With
+        # ijson they are parsed edge by edge rather than loaded whole, unless
+        # responses are being cached, which needs the whole page.
+        while has_next_page and cursor:
+            if ijson is not None and not self.client.use_cache:
+                page = yield from self.stream_trip_page(cursor)
+                page_events = _dig(page, ("data", "trips", "tripEvents")) or {}
+            else:
+                page_events = _dig(self.fetch_trip_page(cursor), ("data", "trips", "tripEvents")) or {}
+                yield from page_events.get("edges") or []
+            page_info = page_events.get("pageInfo") or {}
+            has_next_page = page_info.get("hasNextPage")
+            cursor = page_info.get("endCursor")
 
     def process_user_profile(self, data: Dict[str, Any]) -> UserProfileSummary:
         """Process user profile data into summary statistics"""
-        user_node = data.get("data", {}).get("node", {})
+        user_node = data.get("data", {}).get("profile") or {}
 
-        created_at = user_node.get("createdAt", "")
+        created_at = user_node.get("createdAt") or ""
         years_as_member = 0
-        if created_at:
-            try:
-                dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                years_as_member = self.year - dt.year
-            except:
-                pass
+        # Only the year is needed, and ISO timestamps lead with it
+        if created_at[:4].isdigit():
+            years_as_member = self.year - int(created_at[:4])
 
         return UserProfileSummary(
             member_since=created_at,
@@ -371,84 +512,81 @@ class YearInReviewGenerator:
             positive_review_rate=0.0  # Would need additional query
         )
 
-    def process_trip_data(self, data: Dict[str, Any]) -> TripSummary:
-        """Process trip data into summary statistics"""
-        edges = data.get("data", {}).get("trips", {}).get("tripEvents", {}).get("edges", [])
-
-        total_nights = 0
-        countries = set()
-        cities = set()
-        longest_trip = None
-        max_nights = 0
-
-        for edge in edges:
-            node = edge.get("node", {})
+    def process_trips_and_experiences(
+        self,
+        data: Dict[str, Any],
+        start_date: str,
+        end_date: str
+    ) -> Tuple[TripSummary, ExperienceSummary]:
+        """Process trips in the date range into stay and experience summaries in a single pass"""
+        edges = self.iter_trip_edges(data)
+
+        trip_count = 0
+        stays = []  # (country, city, nights, start_date) per stay
+        exp_cities = set()
+        exp_count = 0
+
+        for edge in _trip_edges_in_range(edges, start_date, end_date):
+            trip_count += 1
+            node = edge["node"]
             product_type = node.get("productType")
 
             if product_type == "STAY":
-                stay = node.get("stayReservation", {})
-                nights = stay.get("numberOfNights", 0)
-                total_nights += nights
-
-                listing = stay.get("listing", {})
-                location = (listing.get("supplyListing", {})
-                           .get("location", {})
-                           .get("defaultAddress", {}))
+                stay = node.get("stayReservation") or {}
+                location = _dig(stay, ("listing", "supplyListing", "location", "defaultAddress")) or {}
 
+                # Locations repeat heavily across stays, so intern them to make
+                # set lookups identity comparisons and share one copy per name
                 country = location.get("country")
                 city = location.get("locality")
-
-                if country:
-                    countries.add(country)
+                stays.append((
+                    sys.intern(country) if country else None,
+                    sys.intern(city) if city else None,
+                    stay.get("numberOfNights", 0),
+                    stay.get("startDate", "")
+                ))
+
+            elif product_type == "EXPERIENCE":
+                exp_count += 1
+                city = _dig(node, ("experienceGuestProfile", "template", "cityNative"))
                 if city:
-                    cities.add(city)
-
-                if nights > max_nights:
-                    max_nights = nights
-                    longest_trip = TripDetail(
-                        location=city or country or "Unknown",
-                        nights=nights,
-                        start_date=stay.get("startDate", "")
-                    )
-
-        return TripSummary(
-            total_trips=len(edges),
-            total_nights=total_nights,
-            countries_visited=sorted(list(countries)),
-            cities_visited=sorted(list(cities)),
-            longest_trip=longest_trip,
-            destinations=sorted(list(cities))
-        )
+                    exp_cities.add(sys.intern(city))
 
-    def process_experience_data(self, data: Dict[str, Any]) -> ExperienceSummary:
-        """Process experience data into summary statistics"""
-        edges = data.get("data", {}).get("trips", {}).get("tripEvents", {}).get("edges", [])
+        countries = {country for country, _, _, _ in stays if country}
+        cities = {city for _, city, _, _ in stays if city}
+        sorted_cities = sorted(cities)
 
-        cities = set()
-        count = 0
-
-        for edge in edges:
-            node = edge.get("node", {})
-            product_type = node.get("productType")
-
-            if product_type == "EXPERIENCE":
-                count += 1
-                exp_profile = node.get("experienceGuestProfile", {})
-                template = exp_profile.get("template", {})
-                city = template.get("cityNative")
-                if city:
-                    cities.add(city)
+        # max keeps the first of equally long stays, and a zero-night stay
+        # doesn't count as an adventure
+        longest = max(stays, key=lambda stay: stay[2], default=None)
+        longest_trip = None
+        if longest and longest[2] > 0:
+            country, city, nights, stay_start = longest
+            longest_trip = TripDetail(
+                location=city or country or "Unknown",
+                nights=nights,
+                start_date=stay_start
+            )
 
-        return ExperienceSummary(
-            total_experiences=count,
+        trips = TripSummary(
+            total_trips=trip_count,
+            total_nights=sum(nights for _, _, nights, _ in stays),
+            countries_visited=sorted(countries),
+            cities_visited=sorted_cities,
+            longest_trip=longest_trip,
+            destinations=list(sorted_cities)
+        )
+        experiences = ExperienceSummary(
+            total_experiences=exp_count,
             categories={},  # Would need category data from API
-            cities=sorted(list(cities))
+            cities=sorted(exp_cities)
         )
+        return trips, experiences
 
     def process_review_data(self, data: Dict[str, Any]) -> ReviewSummary:
         """Process review data into summary statistics"""
         edges = (data.get("data", {})
-                .get("node", {})
+                .get("reviews", {})
                 .get("reviews", {})
                 .get("edges", []))
 
@@ -581,39 +719,31 @@ class YearInReviewGenerator:
         wishlists: WishlistSummary
     ) -> List[str]:
         """Generate highlight statements based on summary data"""
-        highlights = []
-
-        if trips.total_trips > 0:
-            highlights.append(
-                f"🌍 You explored {len(trips.countries_visited)} countries "
-                f"and {len(trips.cities_visited)} cities!"
-            )
-
-        if trips.total_nights > 0:
-            highlights.append(f"🏠 You spent {trips.total_nights} nights away from home")
-
-        if trips.longest_trip:
-            highlights.append(
-                f"⏱️  Your longest adventure: {trips.longest_trip.nights} nights "
-                f"in {trips.longest_trip.location}"
-            )
-
-        if experiences.total_experiences > 0:
-            highlights.append(f"🎭 You tried {experiences.total_experiences} unique experiences")
-
-        if reviews.reviews_written > 0:
-            highlights.append(
-                f"⭐ You wrote {reviews.reviews_written} reviews "
-                f"({reviews.five_star_reviews} were 5-star!)"
-            )
-
-        if wishlists.total_items_saved > 0:
-            highlights.append(
-                f"💝 You saved {wishlists.total_items_saved} places to your wishlists "
-                f"for future adventures"
-            )
+        longest = trips.longest_trip
+
+        # (condition, template, args) - args are only formatted when the condition holds
+        rules = [
+            (trips.total_trips > 0,
+             "🌍 You explored {} countries and {} cities!",
+             (len(trips.countries_visited), len(trips.cities_visited))),
+            (trips.total_nights > 0,
+             "🏠 You spent {} nights away from home",
+             (trips.total_nights,)),
+            (longest is not None,
+             "⏱️  Your longest adventure: {} nights in {}",
+             (longest.nights, longest.location) if longest else ()),
+            (experiences.total_experiences > 0,
+             "🎭 You tried {} unique experiences",
+             (experiences.total_experiences,)),
+            (reviews.reviews_written > 0,
+             "⭐ You wrote {} reviews ({} were 5-star!)",
+             (reviews.reviews_written, reviews.five_star_reviews)),
+            (wishlists.total_items_saved > 0,
+             "💝 You saved {} places to your wishlists for future adventures",
+             (wishlists.total_items_saved,)),
+        ]
 
-        return highlights
+        return [template.format(*args) for condition, template, args in rules if condition]
 
 
 def print_summary(summary: YearInReviewSummary):
@@ -622,36 +752,35 @@ def print_summary(summary: YearInReviewSummary):
 
     def print_card(title: str, content: List[str], emoji: str = ""):
         """Print a single card"""
-        print()
-        print("┌" + "─" * (width - 2) + "┐")
+        # Build the whole card and write it at once rather than line by line
         title_text = f"{emoji} {title}" if emoji else title
         padding = (width - len(title_text) - 2) // 2
-        print("│" + " " * padding + title_text + " " * (width - len(title_text) - padding - 2) + "│")
-        print("├" + "─" * (width - 2) + "┤")
+        parts = [
+            "",
+            "┌" + "─" * (width - 2) + "┐",
+            "│" + " " * padding + title_text + " " * (width - len(title_text) - padding - 2) + "│",
+            "├" + "─" * (width - 2) + "┤",
+        ]
 
         for line in content:
             if len(line) > width - 4:
-                # Wrap long lines
-                words = line.split()
-                current_line = ""
-                for word in words:
-                    if len(current_line) + len(word) + 1 <= width - 4:
-                        current_line += word + " "
-                    else:
-                        print("│ " + current_line.ljust(width - 3) + "│")
-                        current_line = word + " "
-                if current_line:
-                    print("│ " + current_line.strip().ljust(width - 3) + "│")
+                # Wrap long lines one column short of the border, never splitting words
+                for wrapped in textwrap.wrap(" ".join(line.split()), width=width - 5,
+                                             break_long_words=False, break_on_hyphens=False):
+                    parts.append("│ " + wrapped.ljust(width - 3) + "│")
             else:
-                print("│ " + line.ljust(width - 3) + "│")
+                parts.append("│ " + line.ljust(width - 3) + "│")
 
-        print("└" + "─" * (width - 2) + "┘")
+        parts.append("└" + "─" * (width - 2) + "┘")
+        sys.stdout.write("\n".join(parts) + "\n")
 
     # Header
-    print()
-    print("═" * width)
-    print(f"  🎉 YOUR {summary.year} AIRBNB WRAPPED 🎉".center(width))
-    print("═" * width)
+    sys.stdout.write("\n".join([
+        "",
+        "═" * width,
+        f"  🎉 YOUR {summary.year} AIRBNB WRAPPED 🎉".center(width),
+        "═" * width,
+    ]) + "\n")
 
     # Card 1: Your 2024 by the numbers
     card1_content = [
@@ -739,12 +868,14 @@ def print_summary(summary: YearInReviewSummary):
     print_card("LOOKING AHEAD TO 2025", card5_content, "🔮")
 
     # Member info footer
-    print()
-    print("─" * width)
     member_text = f"Airbnb member for {summary.user_profile.years_as_member} years"
-    print(member_text.center(width))
-    print("─" * width)
-    print()
+    sys.stdout.write("\n".join([
+        "",
+        "─" * width,
+        member_text.center(width),
+        "─" * width,
+        "",
+    ]) + "\n")
 
 
 def main():
@@ -772,8 +903,11 @@ Example:
     print("=" * 70)
     print()
 
+    # Past years rarely change, so they're safe to serve from the cache
+    use_cache = os.environ.get("AIRBNB_YIR_CACHE") == "1" and year < datetime.now().year
+
     try:
-        client = ViaductGraphQLClient(viaduct_url, user_id)
+        client = ViaductGraphQLClient(viaduct_url, user_id, use_cache=use_cache)
         generator = YearInReviewGenerator(client, user_id, year)
         summary = generator.generate()
 
@@ -781,14 +915,8 @@ Example:
 
         # Also output JSON for programmatic use
         print("📄 JSON OUTPUT:")
-        summary_dict = asdict(summary)
-        # Convert nested dataclasses to dict if present
-        if summary_dict['trips']['longest_trip']:
-            summary_dict['trips']['longest_trip'] = asdict(summary.trips.longest_trip)
-        if summary_dict.get('travel_personality'):
-            summary_dict['travel_personality'] = asdict(summary.travel_personality)
-        summary_dict['user_profile'] = asdict(summary.user_profile)
-        print(json.dumps(summary_dict, indent=2))
+        # asdict already recurses into the nested dataclasses
+        print(json.dumps(asdict(summary), indent=2))
 
     except Exception as e:
         print(f"❌ Error generating year-in-review: {e}")